@@ -1,19 +1,43 @@
 """定义视频/文本动画相关类"""
 
-import uuid
+import functools
 
 from typing import Union, Optional
-from typing import Literal, Dict, List, Any
+from typing import Literal, Dict, List, Set, Any
 
+from .util import fast_hex_uuid
 from .time_util import Timerange
 
 from .metadata.animation_meta import Animation_meta
 from .metadata import Intro_type, Outro_type, Group_animation_type
 from .metadata import Text_intro, Text_outro, Text_loop_anim
 
+_VIDEO_ANIMATION_TYPES: Dict[type, str] = {Intro_type: "in", Outro_type: "out", Group_animation_type: "group"}
+"""视频动画元数据类型 -> 动画类型"""
+_TEXT_ANIMATION_TYPES: Dict[type, str] = {Text_intro: "in", Text_outro: "out", Text_loop_anim: "loop"}
+"""文本动画元数据类型 -> 动画类型"""
+
+@functools.lru_cache(maxsize=None)
+def _animation_static_json(name: str, effect_id: str, resource_id: str,
+                           animation_type: str, is_video_animation: bool) -> Dict[str, Any]:
+    """动画导出数据中与起止时间无关的部分, 按动画类型缓存, 不应被修改"""
+    return {
+        "anim_adjust_params": None,
+        "platform": "all",
+        "panel": "video" if is_video_animation else "",
+        "material_type": "video" if is_video_animation else "sticker",
+
+        "name": name,
+        "id": effect_id,
+        "type": animation_type,
+        "resource_id": resource_id,
+    }
+
 class Animation:
     """一个视频/文本动画效果"""
 
+    __slots__ = ("name", "effect_id", "animation_type", "resource_id", "start", "duration", "is_video_animation")
+
     name: str
     """动画名称, 默认取为动画效果的名称"""
     effect_id: str
@@ -41,15 +65,8 @@ class Animation:
 
     def export_json(self) -> Dict[str, Any]:
         return {
-            "anim_adjust_params": None,
-            "platform": "all",
-            "panel": "video" if self.is_video_animation else "",
-            "material_type": "video" if self.is_video_animation else "sticker",
-
-            "name": self.name,
-            "id": self.effect_id,
-            "type": self.animation_type,
-            "resource_id": self.resource_id,
+            **_animation_static_json(self.name, self.effect_id, self.resource_id,
+                                     self.animation_type, self.is_video_animation),
 
             "start": self.start,
             "duration": self.duration,
@@ -59,37 +76,33 @@ class Animation:
 class Video_animation(Animation):
     """一个视频动画效果"""
 
+    __slots__ = ()
+
     animation_type: Literal["in", "out", "group"]
 
     def __init__(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type],
                  start: int, duration: int):
+        if type(animation_type) not in _VIDEO_ANIMATION_TYPES:
+            raise TypeError("Invalid animation type %s" % type(animation_type))
         super().__init__(animation_type.value, start, duration)
 
-        if isinstance(animation_type, Intro_type):
-            self.animation_type = "in"
-        elif isinstance(animation_type, Outro_type):
-            self.animation_type = "out"
-        elif isinstance(animation_type, Group_animation_type):
-            self.animation_type = "group"
-
+        self.animation_type = _VIDEO_ANIMATION_TYPES[type(animation_type)]
         self.is_video_animation = True
 
 class Text_animation(Animation):
     """一个文本动画效果"""
 
+    __slots__ = ()
+
     animation_type: Literal["in", "out", "loop"]
 
     def __init__(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
                  start: int, duration: int):
+        if type(animation_type) not in _TEXT_ANIMATION_TYPES:
+            raise TypeError("Invalid animation type %s" % type(animation_type))
         super().__init__(animation_type.value, start, duration)
 
-        if isinstance(animation_type, Text_intro):
-            self.animation_type = "in"
-        elif isinstance(animation_type, Text_outro):
-            self.animation_type = "out"
-        elif isinstance(animation_type, Text_loop_anim):
-            self.animation_type = "loop"
-
+        self.animation_type = _TEXT_ANIMATION_TYPES[type(animation_type)]
         self.is_video_animation = False
 
 class Segment_animations:
@@ -97,15 +110,21 @@ class Segment_animations:
 
     对视频片段：入场、出场或组合动画；对文本片段：入场、出场或循环动画"""
 
+    __slots__ = ("animation_id", "animations", "_types")
+
     animation_id: str
     """系列动画的全局id, 自动生成"""
 
     animations: List[Animation]
     """动画列表"""
 
+    _types: Set[str]
+    """已添加的动画类型"""
+
     def __init__(self):
-        self.animation_id = uuid.uuid4().hex
+        self.animation_id = fast_hex_uuid()
         self.animations = []
+        self._types = set()
 
     def get_animation_trange(self, animation_type: Literal["in", "out", "group", "loop"]) -> Optional[Timerange]:
         """获取指定类型的动画的时间范围"""
@@ -116,19 +135,20 @@ class Segment_animations:
 
     def add_animation(self, animation: Union[Video_animation, Text_animation]) -> None:
         # 不允许添加超过一个同类型的动画（如两个入场动画）
-        if animation.animation_type in [ani.animation_type for ani in self.animations]:
+        if animation.animation_type in self._types:
             raise ValueError(f"当前片段已存在类型为 '{animation.animation_type}' 的动画")
 
         if isinstance(animation, Video_animation):
             # 不允许组合动画与出入场动画同时出现
-            if any(ani.animation_type == "group" for ani in self.animations):
+            if "group" in self._types:
                 raise ValueError("当前片段已存在组合动画, 此时不能添加其它动画")
             if animation.animation_type == "group" and len(self.animations) > 0:
                 raise ValueError("当前片段已存在动画时, 不能添加组合动画")
         elif isinstance(animation, Text_animation):
-            if any(ani.animation_type == "loop" for ani in self.animations):
+            if "loop" in self._types:
                 raise ValueError("当前片段已存在循环动画, 若希望同时使用循环动画和入出场动画, 请先添加出入场动画再添加循环动画")
 
+        self._types.add(animation.animation_type)
         self.animations.append(animation)
 
     def export_json(self) -> Dict[str, Any]:
@@ -197,13 +197,10 @@ class Audio_segment(Media_segment):
             volume (`float`): 音量在`time_offset`处的值
         """
         _property = Keyframe_property.volume
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, volume)
-                return self
-        kf_list = Keyframe_list(_property)
+        kf_list = self.common_keyframes.get(_property)
+        if kf_list is None:
+            kf_list = self.common_keyframes[_property] = Keyframe_list(_property)
         kf_list.add_keyframe(time_offset, volume)
-        self.common_keyframes.append(kf_list)
         return self
 
     def export_json(self) -> Dict[str, Any]:
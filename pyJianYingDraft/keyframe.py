@@ -1,11 +1,23 @@
-import uuid
+import bisect
 
 from enum import Enum
 from typing import Dict, List, Any
 
+from .util import fast_hex_uuid
+
+_KEYFRAME_DEFAULTS: Dict[str, Any] = {
+    "curveType": "Line",
+    "graphID": "",
+    "left_control": {"x": 0.0, "y": 0.0},
+    "right_control": {"x": 0.0, "y": 0.0},
+}
+"""关键帧导出时的默认值, 各关键帧共享, 不应被修改"""
+
 class Keyframe:
     """一个关键帧（关键点）, 目前只支持线性插值"""
 
+    __slots__ = ("kf_id", "time_offset", "values")
+
     kf_id: str
     """关键帧全局id, 自动生成"""
     time_offset: int
@@ -15,18 +27,14 @@ class Keyframe:
 
     def __init__(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 初始化关键帧"""
-        self.kf_id = uuid.uuid4().hex
+        self.kf_id = fast_hex_uuid()
 
         self.time_offset = time_offset
         self.values = [value]
 
     def export_json(self) -> Dict[str, Any]:
         return {
-            # 默认值
-            "curveType": "Line",
-            "graphID": "",
-            "left_control": {"x": 0.0, "y": 0.0},
-            "right_control": {"x": 0.0, "y": 0.0},
+            **_KEYFRAME_DEFAULTS,
             # 自定义属性
             "id": self.kf_id,
             "time_offset": self.time_offset,
@@ -57,25 +65,38 @@ class Keyframe_property(Enum):
 class Keyframe_list:
     """关键帧列表, 记录与某个特定属性相关的一系列关键帧"""
 
+    __slots__ = ("list_id", "keyframe_property", "keyframes", "_offsets")
+
     list_id: str
     """关键帧列表全局id, 自动生成"""
     keyframe_property: Keyframe_property
     """关键帧对应的属性"""
     keyframes: List[Keyframe]
-    """关键帧列表"""
+    """关键帧列表, 按时间偏移量升序排列"""
+
+    _offsets: List[int]
+    """与`keyframes`一一对应的时间偏移量, 用于二分查找插入位置"""
 
     def __init__(self, keyframe_property: Keyframe_property):
         """为给定的关键帧属性初始化关键帧列表"""
-        self.list_id = uuid.uuid4().hex
+        self.list_id = fast_hex_uuid()
 
         self.keyframe_property = keyframe_property
         self.keyframes = []
+        self._offsets = []
 
     def add_keyframe(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 向此关键帧列表中添加一个关键帧"""
         keyframe = Keyframe(time_offset, value)
-        self.keyframes.append(keyframe)
-        self.keyframes.sort(key=lambda x: x.time_offset)
+        # 通常按时间顺序添加, 此时直接追加即可
+        if not self._offsets or time_offset >= self._offsets[-1]:
+            self._offsets.append(time_offset)
+            self.keyframes.append(keyframe)
+            return
+
+        index = bisect.bisect_right(self._offsets, time_offset)
+        self._offsets.insert(index, time_offset)
+        self.keyframes.insert(index, keyframe)
 
     def export_json(self) -> Dict[str, Any]:
         return {
@@ -1,10 +1,16 @@
 import os
 import json
 import warnings
+import functools
 from copy import deepcopy
 
 from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import Type, Dict, List, Set, Tuple, Any
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖, 未安装时退回标准库json
+    orjson = None
 
 from . import util
 from . import exceptions
@@ -20,6 +26,32 @@ from .track import Track_type, Base_track, Track
 
 from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 
+@functools.lru_cache(maxsize=None)
+def _read_template(file_name: str) -> str:
+    """读取包内的草稿模板文件, 结果在进程内缓存"""
+    with open(os.path.join(os.path.dirname(__file__), file_name), "r", encoding="utf-8") as f:
+        return f.read()
+
+_MATERIAL_DISPATCH: Dict[type, Tuple[str, str]] = {
+    Video_material: ("videos", "material_id"),
+    Audio_material: ("audios", "material_id"),
+    Audio_fade: ("audio_fades", "fade_id"),
+    Audio_effect: ("audio_effects", "effect_id"),
+    Segment_animations: ("animations", "animation_id"),
+    Video_effect: ("video_effects", "global_id"),
+    Transition: ("transitions", "global_id"),
+    Filter: ("filters", "global_id"),
+}
+"""素材类型 -> (`Script_material`中对应的列表名, 素材id的属性名)"""
+
+@functools.lru_cache(maxsize=None)
+def _material_entry(cls: type) -> Optional[Tuple[str, str]]:
+    """沿继承链查找素材类型在`_MATERIAL_DISPATCH`中的条目, 使子类也能被识别, 结果按类型缓存"""
+    for base in cls.__mro__:
+        if base in _MATERIAL_DISPATCH:
+            return _MATERIAL_DISPATCH[base]
+    return None
+
 class Script_material:
     """草稿文件中的素材信息部分"""
 
@@ -50,6 +82,9 @@ class Script_material:
     filters: List[Filter]
     """滤镜效果列表"""
 
+    _id_index: Dict[str, Tuple[List[Any], int, Set[str]]]
+    """各素材列表的id索引, 以列表名为键, 值为(建立索引时的列表对象, 当时的列表长度, 素材id集合)"""
+
     def __init__(self):
         self.audios = []
         self.videos = []
@@ -66,6 +101,37 @@ class Script_material:
         self.transitions = []
         self.filters = []
 
+        self._id_index = {}
+
+    def add(self, item: Union[Video_material, Audio_material, Audio_fade, Audio_effect,
+                              Segment_animations, Video_effect, Transition, Filter]) -> None:
+        """将素材添加到相应的素材列表中
+
+        Raises:
+            `TypeError`: 不支持的素材类型
+        """
+        entry = _material_entry(type(item))
+        if entry is None:
+            raise TypeError("Invalid argument type '%s'" % type(item))
+        collection, id_attr = entry
+        ids = self._ids(collection, id_attr)
+        items = getattr(self, collection)
+        items.append(item)
+        ids.add(getattr(item, id_attr))
+        self._id_index[collection] = (items, len(items), ids)
+
+    def _ids(self, collection: str, id_attr: str) -> Set[str]:
+        """指定素材列表中各素材的id集合
+
+        素材列表是公开属性, 可能被直接追加、删除或整体替换, 故列表对象或长度与建立索引时不同时重新构建索引
+        """
+        items = getattr(self, collection)
+        index = self._id_index.get(collection)
+        if index is None or index[0] is not items or index[1] != len(items):
+            index = (items, len(items), {getattr(item, id_attr) for item in items})
+            self._id_index[collection] = index
+        return index[2]
+
     @overload
     def __contains__(self, item: Union[Video_material, Audio_material]) -> bool: ...
     @overload
@@ -74,30 +140,17 @@ class Script_material:
     def __contains__(self, item: Union[Segment_animations, Video_effect, Transition, Filter]) -> bool: ...
 
     def __contains__(self, item) -> bool:
-        if isinstance(item, Video_material):
-            return item.material_id in [video.material_id for video in self.videos]
-        elif isinstance(item, Audio_material):
-            return item.material_id in [audio.material_id for audio in self.audios]
-        elif isinstance(item, Audio_fade):
-            return item.fade_id in [fade.fade_id for fade in self.audio_fades]
-        elif isinstance(item, Audio_effect):
-            return item.effect_id in [effect.effect_id for effect in self.audio_effects]
-        elif isinstance(item, Segment_animations):
-            return item.animation_id in [ani.animation_id for ani in self.animations]
-        elif isinstance(item, Video_effect):
-            return item.global_id in [effect.global_id for effect in self.video_effects]
-        elif isinstance(item, Transition):
-            return item.global_id in [transition.global_id for transition in self.transitions]
-        elif isinstance(item, Filter):
-            return item.global_id in [filter_.global_id for filter_ in self.filters]
-        else:
+        entry = _material_entry(type(item))
+        if entry is None:
             raise TypeError("Invalid argument type '%s'" % type(item))
+        collection, id_attr = entry
+        return getattr(item, id_attr) in self._ids(collection, id_attr)
 
     def contains_material(self, segment: Union[Video_segment, Sticker_segment, Audio_segment, Text_segment]) -> bool:
         if isinstance(segment, Video_segment):
-            return segment.material_id in [video.material_id for video in self.videos]
+            return segment.material_id in self._ids("videos", "material_id")
         elif isinstance(segment, Audio_segment):
-            return segment.material_id in [audio.material_id for audio in self.audios]
+            return segment.material_id in self._ids("audios", "material_id")
         elif isinstance(segment, (Text_segment, Sticker_segment)):
             return True  # 文本素材和贴纸素材暂不检查
         else:
@@ -202,8 +255,9 @@ class Script_file:
         self.imported_materials = {}
         self.imported_tracks = []
 
-        with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
-            self.content = json.load(f)
+        # 每次重新解析缓存的模板文本, 以得到互不共享的草稿内容
+        template = _read_template(self.TEMPLATE_FILE)
+        self.content = orjson.loads(template) if orjson is not None else json.loads(template)
 
     @staticmethod
     def load_template(json_path: str) -> "Script_file":
@@ -232,14 +286,11 @@ class Script_file:
 
     def add_material(self, material: Union[Video_material, Audio_material]) -> "Script_file":
         """向草稿文件中添加一个素材"""
+        if not isinstance(material, (Video_material, Audio_material)):
+            raise TypeError("错误的素材类型: '%s'" % type(material))
         if material in self.materials:  # 素材已存在
             return self
-        if isinstance(material, Video_material):
-            self.materials.videos.append(material)
-        elif isinstance(material, Audio_material):
-            self.materials.audios.append(material)
-        else:
-            raise TypeError("错误的素材类型: '%s'" % type(material))
+        self.materials.add(material)
         return self
 
     def add_track(self, track_type: Track_type, track_name: Optional[str] = None, *,
@@ -311,21 +362,21 @@ class Script_file:
         if isinstance(segment, Video_segment):
             # 出入场等动画
             if (segment.animations_instance is not None) and (segment.animations_instance not in self.materials):
-                self.materials.animations.append(segment.animations_instance)
+                self.materials.add(segment.animations_instance)
             # 特效
             for effect in segment.effects:
                 if effect not in self.materials:
-                    self.materials.video_effects.append(effect)
+                    self.materials.add(effect)
             # 滤镜
             for filter_ in segment.filters:
                 if filter_ not in self.materials:
-                    self.materials.filters.append(filter_)
+                    self.materials.add(filter_)
             # 蒙版
             if segment.mask is not None:
                 self.materials.masks.append(segment.mask.export_json())
             # 转场
             if (segment.transition is not None) and (segment.transition not in self.materials):
-                self.materials.transitions.append(segment.transition)
+                self.materials.add(segment.transition)
 
             self.materials.speeds.append(segment.speed)
         elif isinstance(segment, Sticker_segment):
@@ -333,16 +384,16 @@ class Script_file:
         elif isinstance(segment, Audio_segment):
             # 淡入淡出
             if (segment.fade is not None) and (segment.fade not in self.materials):
-                self.materials.audio_fades.append(segment.fade)
+                self.materials.add(segment.fade)
             # 特效
             for effect in segment.effects:
                 if effect not in self.materials:
-                    self.materials.audio_effects.append(effect)
+                    self.materials.add(effect)
             self.materials.speeds.append(segment.speed)
         elif isinstance(segment, Text_segment):
             # 出入场等动画
             if (segment.animations_instance is not None) and (segment.animations_instance not in self.materials):
-                self.materials.animations.append(segment.animations_instance)
+                self.materials.add(segment.animations_instance)
             # 字幕样式
             self.materials.texts.append(segment.export_material())
 
@@ -378,7 +429,7 @@ class Script_file:
 
         # 自动添加相关素材
         if segment.effect_inst not in self.materials:
-            self.materials.video_effects.append(segment.effect_inst)
+            self.materials.add(segment.effect_inst)
         return self
 
     def add_filter(self, filter_meta: Filter_type, t_range: Timerange,
@@ -404,7 +455,7 @@ class Script_file:
         self.duration = max(self.duration, t_range.end)
 
         # 自动添加相关素材
-        self.materials.filters.append(segment.material)
+        self.materials.add(segment.material)
         return self
 
     def import_srt(self, srt_path: str, track_name: str, *,
@@ -626,8 +677,8 @@ class Script_file:
         for sticker in self.imported_materials["stickers"]:
             print("\tResource id: %s '%s'" % (sticker["resource_id"], sticker.get("name", "")))
 
-    def dumps(self) -> str:
-        """将草稿文件内容导出为JSON字符串"""
+    def _update_content(self) -> None:
+        """将当前的素材及轨道等信息写入草稿文件内容"""
         self.content["fps"] = self.fps
         self.content["duration"] = self.duration
         self.content["canvas_config"] = {"width": self.width, "height": self.height, "ratio": "original"}
@@ -646,12 +697,27 @@ class Script_file:
         track_list.sort(key=lambda track: track.render_index)
         self.content["tracks"] = [track.export_json() for track in track_list]
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+    def dumps(self) -> str:
+        """将草稿文件内容导出为JSON字符串, 无论是否安装orjson均使用2空格缩进"""
+        self._update_content()
+        if orjson is not None:
+            return orjson.dumps(self.content, option=orjson.OPT_INDENT_2).decode("utf-8")
+        return json.dumps(self.content, ensure_ascii=False, indent=2)
 
     def dump(self, file_path: str) -> None:
-        """将草稿文件内容写入文件"""
+        """将草稿文件内容写入文件, 格式与`dumps`一致
+
+        安装了orjson时一次性序列化后写入, 否则使用标准库逐块编码写入, 不在内存中构造完整的JSON字符串
+        """
+        self._update_content()
+        if orjson is not None:
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(self.content, option=orjson.OPT_INDENT_2))
+            return
+
         with open(file_path, "w", encoding="utf-8") as f:
-            f.write(self.dumps())
+            for chunk in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(self.content):
+                f.write(chunk)
 
     def save(self) -> None:
         """保存草稿文件至打开时的路径, 仅在模板模式下可用
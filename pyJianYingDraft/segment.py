@@ -1,15 +1,32 @@
 """定义片段基类及部分比较通用的属性类"""
 
-import uuid
-
 from typing import Optional, Dict, List, Any
 
+from .util import fast_hex_uuid
 from .time_util import Timerange
-from .keyframe import Keyframe_list
+from .keyframe import Keyframe_property, Keyframe_list
+
+_SEGMENT_DEFAULTS: Dict[str, Any] = {
+    "enable_adjust": True,
+    "enable_color_correct_adjust": False,
+    "enable_color_curves": True,
+    "enable_color_match_adjust": False,
+    "enable_color_wheels": True,
+    "enable_lut": True,
+    "enable_smart_color_adjust": False,
+    "last_nonzero_volume": 1.0,
+    "reverse": False,
+    "track_attribute": 0,
+    "track_render_index": 0,
+    "visible": True,
+}
+"""各种片段导出时共有的默认属性"""
 
 class Base_segment:
     """片段基类"""
 
+    __slots__ = ("segment_id", "material_id", "target_timerange", "common_keyframes")
+
     segment_id: str
     """片段全局id, 由程序自动生成"""
     material_id: str
@@ -17,15 +34,15 @@ class Base_segment:
     target_timerange: Timerange
     """片段在轨道上的时间范围"""
 
-    common_keyframes: List[Keyframe_list]
-    """各属性的关键帧列表"""
+    common_keyframes: Dict[Keyframe_property, Keyframe_list]
+    """各属性的关键帧列表, 以属性为键"""
 
     def __init__(self, material_id: str, target_timerange: Timerange):
-        self.segment_id = uuid.uuid4().hex
+        self.segment_id = fast_hex_uuid()
         self.material_id = material_id
         self.target_timerange = target_timerange
 
-        self.common_keyframes = []
+        self.common_keyframes = {}
 
     @property
     def start(self) -> int:
@@ -55,24 +72,13 @@ class Base_segment:
     def export_json(self) -> Dict[str, Any]:
         """返回通用于各种片段的属性"""
         return {
-            "enable_adjust": True,
-            "enable_color_correct_adjust": False,
-            "enable_color_curves": True,
-            "enable_color_match_adjust": False,
-            "enable_color_wheels": True,
-            "enable_lut": True,
-            "enable_smart_color_adjust": False,
-            "last_nonzero_volume": 1.0,
-            "reverse": False,
-            "track_attribute": 0,
-            "track_render_index": 0,
-            "visible": True,
+            **_SEGMENT_DEFAULTS,
             # 写入自定义字段
             "id": self.segment_id,
             "material_id": self.material_id,
-            "target_timerange": self.target_timerange.export_json(),
+            "target_timerange": {"start": self.target_timerange.start, "duration": self.target_timerange.duration},
 
-            "common_keyframes": [kf_list.export_json() for kf_list in self.common_keyframes],
+            "common_keyframes": [kf_list.export_json() for kf_list in self.common_keyframes.values()],
             "keyframe_refs": [],  # 意义不明
         }
 
@@ -85,7 +91,7 @@ class Speed:
     """播放速度"""
 
     def __init__(self, speed: float):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = fast_hex_uuid()
         self.speed = speed
 
     def export_json(self) -> Dict[str, Any]:
@@ -100,6 +106,9 @@ class Speed:
 class Clip_settings:
     """素材片段的图像调节设置"""
 
+    __slots__ = ("alpha", "flip_horizontal", "flip_vertical", "rotation",
+                 "scale_x", "scale_y", "transform_x", "transform_y")
+
     alpha: float
     """图像不透明度, 0-1"""
     flip_horizontal: bool
@@ -154,6 +163,8 @@ class Clip_settings:
 class Media_segment(Base_segment):
     """媒体片段基类"""
 
+    __slots__ = ("source_timerange", "speed", "volume", "extra_material_refs")
+
     source_timerange: Optional[Timerange]
     """截取的素材片段的时间范围, 对贴纸而言不存在"""
     speed: Speed
@@ -176,10 +187,11 @@ class Media_segment(Base_segment):
     def export_json(self) -> Dict[str, Any]:
         """返回通用于音频和视频片段的默认属性"""
         ret = super().export_json()
-        ret.update({
-            "source_timerange": self.source_timerange.export_json() if self.source_timerange else None,
-            "speed": self.speed.speed,
-            "volume": self.volume,
-            "extra_material_refs": self.extra_material_refs,
-        })
+        if self.source_timerange is not None:
+            ret["source_timerange"] = {"start": self.source_timerange.start, "duration": self.source_timerange.duration}
+        else:
+            ret["source_timerange"] = None
+        ret["speed"] = self.speed.speed
+        ret["volume"] = self.volume
+        ret["extra_material_refs"] = self.extra_material_refs
         return ret
@@ -1,7 +1,6 @@
 """与模板模式相关的类及函数等"""
 
 from enum import Enum
-from copy import deepcopy
 
 from . import util
 from . import exceptions
@@ -10,7 +9,7 @@ from .segment import Base_segment
 from .track import Base_track, Track_type
 from .local_materials import Video_material, Audio_material
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class Shrink_mode(Enum):
     """处理替换素材时素材变短情况的方法"""
@@ -44,35 +43,39 @@ class Imported_media_segment(Base_segment):
     """导入的视频/音频片段"""
 
     raw_data: Dict[str, Any]
-    """原始数据"""
+    """原始数据, 与导入的草稿内容共享, 不应直接修改"""
 
     source_timerange: Timerange
     """片段取用的素材时间范围"""
 
     __DATA_ATTRS = ["material_id", "source_timerange", "target_timerange"]
     def __init__(self, json_data: Dict[str, Any]):
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = json_data
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
     def export_json(self) -> Dict[str, Any]:
-        json_data = deepcopy(self.raw_data)
-        json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
-        return json_data
+        # 被覆盖的字段均为新构造或不可变的对象, 故浅复制原始数据即可
+        return {
+            **self.raw_data,
+            "material_id": self.material_id,
+            "source_timerange": {"start": self.source_timerange.start, "duration": self.source_timerange.duration},
+            "target_timerange": {"start": self.target_timerange.start, "duration": self.target_timerange.duration},
+        }
 
 class Imported_track(Base_track):
     """模板模式下导入的轨道"""
 
     raw_data: Dict[str, Any]
-    """原始轨道数据"""
+    """原始轨道数据, 仅复制顶层, 其中各片段的数据与导入的草稿内容共享"""
 
     def __init__(self, json_data: Dict[str, Any]):
         self.track_type = Track_type.from_name(json_data["type"])
         self.name = json_data["name"]
         self.track_id = json_data["id"]
-        self.render_index = max([int(seg["render_index"]) for seg in json_data["segments"]])
+        self.render_index = max((int(seg["render_index"]) for seg in json_data["segments"]), default=0)
 
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = dict(json_data)
 
     def export_json(self) -> Dict[str, Any]:
         return self.raw_data
@@ -88,24 +91,34 @@ class Imported_text_track(Editable_track):
 
     def __init__(self, json_data: Dict[str, Any]):
         super().__init__(json_data)
-        self.segments = deepcopy(json_data["segments"])
+        self.segments = list(json_data["segments"])
 
     def __len__(self):
         return len(self.segments)
 
     def export_json(self) -> Dict[str, Any]:
-        self.raw_data.update({"segments": deepcopy(self.segments)})
+        self.raw_data.update({"segments": list(self.segments)})
         return self.raw_data
 
 class Imported_media_track(Editable_track):
     """模板模式下导入的音频/视频轨道"""
 
     segments: List[Imported_media_segment]
-    """该轨道包含的片段列表"""
+    """该轨道包含的片段列表
+
+    替换素材所导致的后续片段平移会被暂存, 在读取片段的起始时间前应先调用`flush_shifts`
+    """
+
+    _shift_tree: Optional[List[int]]
+    """尚未应用的片段平移, 以树状数组记录: 在下标i处加上平移量表示下标不小于i的片段均平移该值
+
+    其前缀和即为对应片段的累计平移量, 没有暂存的平移时为None
+    """
 
     def __init__(self, json_data: Dict[str, Any]):
         super().__init__(json_data)
         self.segments = [Imported_media_segment(seg) for seg in json_data["segments"]]
+        self._shift_tree = None
 
     def __len__(self):
         return len(self.segments)
@@ -115,6 +128,7 @@ class Imported_media_track(Editable_track):
         """轨道起始时间, 微秒"""
         if len(self.segments) == 0:
             return 0
+        self.flush_shifts()
         return self.segments[0].target_timerange.start
 
     @property
@@ -122,8 +136,54 @@ class Imported_media_track(Editable_track):
         """轨道结束时间, 微秒"""
         if len(self.segments) == 0:
             return 0
+        self.flush_shifts()
         return self.segments[-1].target_timerange.end
 
+    def _shift_from(self, first_index: int, delta: int) -> None:
+        """暂存一次平移: 将下标不小于`first_index`的片段平移`delta`微秒"""
+        n = len(self.segments)
+        if first_index >= n:
+            return
+        if self._shift_tree is None:
+            self._shift_tree = [0] * (n + 1)
+
+        tree = self._shift_tree
+        i = first_index + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _segment_start(self, index: int) -> int:
+        """计入暂存的平移后, 指定片段的起始时间"""
+        start = self.segments[index].start
+        tree = self._shift_tree
+        if tree is not None:
+            i = index + 1
+            while i > 0:
+                start += tree[i]
+                i -= i & -i
+        return start
+
+    def flush_shifts(self) -> None:
+        """将暂存的片段平移一次性应用到各片段上"""
+        tree = self._shift_tree
+        if tree is None:
+            return
+        self._shift_tree = None
+
+        # 将树状数组原地还原为各下标处的平移量, 再累加得到每个片段的平移
+        n = len(self.segments)
+        for i in range(n, 0, -1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] -= tree[i]
+
+        shift = 0
+        for seg, delta in zip(self.segments, tree[1:]):
+            shift += delta
+            if shift != 0:
+                seg.start += shift
+
     def check_material_type(self, material: object) -> bool:
         """检查素材类型是否与轨道类型匹配"""
         if self.track_type == Track_type.video and isinstance(material, Video_material):
@@ -147,8 +207,7 @@ class Imported_media_track(Editable_track):
                 seg.duration -= delta_duration
             elif shrink == Shrink_mode.cut_tail_align:
                 seg.duration -= delta_duration
-                for i in range(seg_index+1, len(self.segments)):  # 后续片段也依次前移相应值（保持间隙）
-                    self.segments[i].start -= delta_duration
+                self._shift_from(seg_index+1, -delta_duration)  # 后续片段也依次前移相应值（保持间隙）
             elif shrink == Shrink_mode.shrink:
                 seg.duration -= delta_duration
                 seg.start += delta_duration // 2
@@ -157,23 +216,24 @@ class Imported_media_track(Editable_track):
         # 时长变长
         elif new_duration > seg.duration:
             success_flag = False
-            prev_seg_end = int(0) if seg_index == 0 else self.segments[seg_index-1].target_timerange.end
-            next_seg_start = int(1e15) if seg_index == len(self.segments)-1 else self.segments[seg_index+1].start
+            seg_start = self._segment_start(seg_index)
+            seg_end = seg_start + seg.duration
+            prev_seg_end = int(0) if seg_index == 0 else self._segment_start(seg_index-1) + self.segments[seg_index-1].duration
+            next_seg_start = int(1e15) if seg_index == len(self.segments)-1 else self._segment_start(seg_index+1)
             for mode in extend:
                 if mode == Extend_mode.extend_head:
-                    if seg.start - delta_duration >= prev_seg_end:
+                    if seg_start - delta_duration >= prev_seg_end:
                         seg.start -= delta_duration
                         success_flag = True
                 elif mode == Extend_mode.extend_tail:
-                    if seg.target_timerange.end + delta_duration <= next_seg_start:
+                    if seg_end + delta_duration <= next_seg_start:
                         seg.duration += delta_duration
                         success_flag = True
                 elif mode == Extend_mode.push_tail:
-                    shift_duration = max(0, seg.target_timerange.end + delta_duration - next_seg_start)
+                    shift_duration = max(0, seg_end + delta_duration - next_seg_start)
                     seg.duration += delta_duration
                     if shift_duration > 0:  # 有必要时后移后续片段
-                        for i in range(seg_index+1, len(self.segments)):
-                            self.segments[i].start += shift_duration
+                        self._shift_from(seg_index+1, shift_duration)
                     success_flag = True
                 elif mode == Extend_mode.cut_material_tail:
                     src_timerange.duration = seg.duration
@@ -190,6 +250,7 @@ class Imported_media_track(Editable_track):
         seg.source_timerange = src_timerange
 
     def export_json(self) -> Dict[str, Any]:
+        self.flush_shifts()
         self.raw_data.update({"segments": [seg.export_json() for seg in self.segments]})
         return self.raw_data
 
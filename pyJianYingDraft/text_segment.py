@@ -1,17 +1,186 @@
 import json
-import uuid
+import math
 
 from typing import Dict, List, Tuple, Any
 from typing import Union, Optional, Literal
 
+from .util import fast_hex_uuid
 from .time_util import Timerange, tim
 from .segment import Base_segment, Clip_settings
 from .animation import Segment_animations, Text_animation
 
 from .metadata import Text_intro, Text_outro, Text_loop_anim
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖, 未安装时退回标准库json
+    orjson = None
+
+_BOOL_JSON: Dict[bool, str] = {False: "false", True: "true"}
+"""布尔值的JSON表示"""
+
+def _check_number(name: str, value: Any) -> None:
+    """检查数值可以直接写入content字段的JSON字符串中, 即为有限的int或float"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} 应为有限的数值, 得到: {value!r}")
+
+_content_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+"""未安装orjson时所用的编码器, 预先构造以免每次调用`json.dumps`时重新创建"""
+
+def _dumps_content(obj: Any) -> str:
+    """将文本素材content字段中的对象序列化为JSON字符串"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return _content_encoder.encode(obj)
+
+_TEXT_MATERIAL_DEFAULTS: Dict[str, Any] = {
+    "add_type": 0,
+
+    "base_content": "",
+    "bold_width": 0.0,
+
+    "fixed_height": -1.0,
+    "fixed_width": -1.0,
+    "force_apply_line_max_width": False,
+
+    "group_id": "",
+
+    "initial_scale": 1.0,
+    "inner_padding": -1.0,
+    "is_rich_text": False,
+    "italic_degree": 0,
+    "ktv_color": "",
+    "language": "",
+    "layer_weight": 1,
+    "letter_spacing": 0.0,
+    "line_feed": 1,
+    "line_max_width": 0.82,
+    "line_spacing": 0.02,
+    "multi_language_current": "none",
+    "name": "",
+
+    "preset_category": "",
+    "preset_category_id": "",
+    "preset_has_set_alignment": False,
+    "preset_id": "",
+    "preset_index": 0,
+    "preset_name": "",
+
+    "recognize_task_id": "",
+    "recognize_type": 0,
+
+    "shape_clip_x": False,
+    "shape_clip_y": False,
+    "source_from": "",
+    "style_name": "",
+    "sub_type": 0,
+    "subtitle_keywords": None,
+    "subtitle_template_original_fontsize": 0.0,
+    "tts_auto_update": False,
+    "type": "text",
+
+    "underline_offset": 0.22,
+    "underline_width": 0.05,
+
+    "use_effect_default_color": True,
+}
+"""文本素材中与具体片段无关的默认属性, 仅包含不可变的值"""
+
+_TEXT_MATERIAL_EFFECT_FIELDS: Dict[str, Dict[str, Any]] = {
+    # 用途未知
+    "caption_template": {
+        "caption_template_info": {
+            "category_id": "",
+            "category_name": "",
+            "effect_id": "",
+            "is_new": False,
+            "path": "",
+            "request_id": "",
+            "resource_id": "",
+            "resource_name": "",
+            "source_platform": 0
+        },
+    },
+
+    # 混合 (check_flag +4)
+    "blend": {
+        "global_alpha": 1.0,
+    },
+
+    # 描边 (check_flag +8), 似乎也会被content覆盖
+    "border": {
+        "border_alpha": 1.0,
+        "border_color": "",
+        "border_width": 0.08,
+    },
+
+    # 背景 (check_flag +16)
+    "background": {
+        "background_style": 0,
+        "background_color": "",
+        "background_alpha": 1.0,
+        "background_round_radius": 0.0,
+        "background_height": 0.14,
+        "background_width": 0.14,
+        "background_horizontal_offset": 0.0,
+        "background_vertical_offset": 0.0,
+    },
+
+    # 发光 (check_flag +64), 属性由extra_material_refs记录, 素材中无对应字段
+
+    # 阴影 (check_flag +32)
+    "shadow": {
+        "has_shadow": False,
+        "shadow_alpha": 0.9,
+        "shadow_angle": -45.0,
+        "shadow_color": "",
+        "shadow_distance": 5.0,
+        "shadow_point": {
+            "x": 0.6363961030678928,
+            "y": -0.6363961030678928
+        },
+        "shadow_smoothing": 0.45,
+    },
+
+    # 整体字体设置, 似乎会被content覆盖
+    "font": {
+        "font_category_id": "",
+        "font_category_name": "",
+        "font_id": "",
+        "font_name": "",
+        "font_path": "",
+        "font_resource_id": "",
+        "font_size": 15.0,
+        "font_source_platform": 0,
+        "font_team_id": "",
+        "font_title": "none",
+        "font_url": "",
+        "fonts": [],
+    },
+
+    # 似乎会被content覆盖
+    "text": {
+        "text_alpha": 1.0,
+        "text_color": "#FFFFFF",
+        "text_curve": None,
+        "text_preset_resource_id": "",
+        "text_size": 30,
+        "underline": False,
+    },
+}
+"""剪映文本素材中目前未导出的字段及其默认值, 按所属效果分组, 供实现相应效果时参考"""
+
+_TEXT_SEGMENT_DEFAULTS: Dict[str, Any] = {
+    "source_timerange": None,
+    "speed": 1.0,
+    "volume": 1.0,
+}
+"""文本片段导出时与Media_segment一致的默认属性"""
+
 class Text_style:
-    """字体样式类"""
+    """字体样式类, 构造后不可修改, 可用作字典键或缓存键"""
+
+    __slots__ = ("size", "bold", "italic", "underline", "color", "alpha", "align", "vertical")
 
     size: float
     """字体大小"""
@@ -46,17 +215,70 @@ class Text_style:
             alpha (`float`, optional): 字体不透明度, 取值范围[0, 1], 默认不透明
             align (`int`, optional): 对齐方式, 0: 左对齐, 1: 居中, 2: 右对齐, 默认为左对齐
             vertical (`bool`, optional): 是否是竖排文本, 默认为否
+
+        Raises:
+            `ValueError`: 颜色不是RGB三元组, 或字体大小、颜色分量、不透明度不是有限的数值
         """
-        self.size = size
-        self.bold = bold
-        self.italic = italic
-        self.underline = underline
+        color = tuple(color)
+        if len(color) != 3:
+            raise ValueError(f"color 应为RGB三元组, 得到: {color!r}")
+        _check_number("size", size)
+        _check_number("alpha", alpha)
+        for component in color:
+            _check_number("color", component)
+
+        # 样式不可修改, 故在此一次性将开关类参数规整为bool
+        setattr_ = object.__setattr__
+        setattr_(self, "size", size)
+        setattr_(self, "bold", bool(bold))
+        setattr_(self, "italic", bool(italic))
+        setattr_(self, "underline", bool(underline))
+
+        setattr_(self, "color", color)
+        setattr_(self, "alpha", alpha)
+
+        setattr_(self, "align", align)
+        setattr_(self, "vertical", bool(vertical))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Text_style is immutable, cannot assign to '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Text_style is immutable, cannot delete '{name}'")
+
+    def _fields(self) -> Tuple[Any, ...]:
+        """按构造参数顺序排列的各字段值"""
+        return (self.size, self.bold, self.italic, self.underline,
+                self.color, self.alpha, self.align, self.vertical)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Text_style):
+            return NotImplemented
+        return self is other or self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        return ("Text_style(size=%r, bold=%r, italic=%r, underline=%r, color=%r, alpha=%r, align=%r, vertical=%r)"
+                % self._fields())
+
+    # 默认的复制及反序列化流程会通过setattr恢复各字段, 故需绕开__setattr__
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self._fields()
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __copy__(self) -> "Text_style":
+        return self
 
-        self.color = color
-        self.alpha = alpha
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Text_style":
+        return self
 
-        self.align = align
-        self.vertical = vertical
+_DEFAULT_TEXT_STYLE = Text_style()
+"""未指定样式的文本片段所共享的默认字体样式"""
 
 class Text_border:
     """文本描边的参数"""
@@ -85,7 +307,7 @@ class Text_border:
             "content": {
                 "solid": {
                     "alpha": self.alpha,
-                    "color": list(self.color),
+                    "color": self.color,
                 }
             },
             "width": self.width
@@ -94,10 +316,13 @@ class Text_border:
 class Text_segment(Base_segment):
     """文本片段类, 目前仅支持设置基本的字体样式"""
 
+    __slots__ = ("text", "style", "clip_settings", "border", "animations_instance", "extra_material_refs",
+                 "_content_cache")
+
     text: str
     """文本内容"""
     style: Text_style
-    """字体样式"""
+    """字体样式, 不可修改, 需要改变样式时应替换为新的`Text_style`对象"""
 
     clip_settings: Clip_settings
     """图像调节设置"""
@@ -113,6 +338,9 @@ class Text_segment(Base_segment):
     extra_material_refs: List[str]
     """附加的素材id列表, 用于链接动画/特效等"""
 
+    _content_cache: Optional[Tuple[Tuple[Any, ...], str]]
+    """上次导出的素材content字段及其所依赖的文本、样式和描边参数"""
+
     def __init__(self, text: str, timerange: Timerange, *,
                  style: Optional[Text_style] = None, clip_settings: Optional[Clip_settings] = None,
                  border: Optional[Text_border] = None):
@@ -127,15 +355,16 @@ class Text_segment(Base_segment):
             clip_settings (`Clip_settings`, optional): 图像调节设置, 默认不做任何变换
             border (`Text_border`, optional): 文本描边参数, 默认无描边
         """
-        super().__init__(uuid.uuid4().hex, timerange)
+        super().__init__(fast_hex_uuid(), timerange)
 
         self.text = text
-        self.style = style or Text_style()
+        self.style = style if style is not None else _DEFAULT_TEXT_STYLE
         self.clip_settings = clip_settings or Clip_settings()
         self.border = border
 
         self.animations_instance = None
         self.extra_material_refs = []
+        self._content_cache = None
 
     def add_animation(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
                       duration: Union[str, float] = 500000) -> "Text_segment":
@@ -170,187 +399,57 @@ class Text_segment(Base_segment):
 
         return self
 
+    def _export_content(self) -> str:
+        """导出素材的content字段, 文本、样式及描边均未变化时复用上次的结果"""
+        style, border = self.style, self.border
+        key = (self.text, style,
+               (border.alpha, tuple(border.color), border.width) if border else None)
+        if self._content_cache is not None and self._content_cache[0] == key:
+            return self._content_cache[1]
+
+        # content的结构固定, 直接拼接JSON字符串, 仅对文本及描边调用序列化
+        r, g, b = style.color
+        strokes = _dumps_content([border.export_json()]) if border else "[]"
+        content = (
+            '{"styles":[{"fill":{"alpha":1.0,"content":{"render_type":"solid","solid":'
+            f'{{"alpha":{style.alpha},'
+            f'"color":[{r},{g},{b}]}}}}}},'
+            f'"range":[0,{len(self.text)}],"size":{style.size},'
+            f'"bold":{_BOOL_JSON[style.bold]},"italic":{_BOOL_JSON[style.italic]},'
+            f'"underline":{_BOOL_JSON[style.underline]},"strokes":{strokes}}}],'
+            f'"text":{_dumps_content(self.text)}}}'
+        )
+        self._content_cache = (key, content)
+        return content
+
     def export_material(self) -> Dict[str, Any]:
         """与此文本片段联系的素材, 以此不再单独定义Text_material类"""
-        # 叠加各类效果的flag
+        # 叠加各类效果的flag, 各效果对应的位见`_TEXT_MATERIAL_EFFECT_FIELDS`
         check_flag: int = 7
         if self.border: check_flag |= 8
 
-        return {
-            "add_type": 0,
-
-            "typesetting": int(self.style.vertical),
-            "alignment": self.style.align,
-
-            # ?
-            # "caption_template_info": {
-            #     "category_id": "",
-            #     "category_name": "",
-            #     "effect_id": "",
-            #     "is_new": False,
-            #     "path": "",
-            #     "request_id": "",
-            #     "resource_id": "",
-            #     "resource_name": "",
-            #     "source_platform": 0
-            # },
-
-            # 混合 (+4)
-            # "global_alpha": 1.0,
-
-            # 描边 (+8), 似乎也会被content覆盖
-            # "border_alpha": 1.0,
-            # "border_color": "",
-            # "border_width": 0.08,
-
-            # 背景 (+16)
-            # "background_style": 0,
-            # "background_color": "",
-            # "background_alpha": 1.0,
-            # "background_round_radius": 0.0,
-            # "background_height": 0.14,
-            # "background_width": 0.14,
-            # "background_horizontal_offset": 0.0,
-            # "background_vertical_offset": 0.0,
-
-            # 发光 (+64)，属性由extra_material_refs记录
-
-            # 阴影 (+32)
-            # "has_shadow": False,
-            # "shadow_alpha": 0.9,
-            # "shadow_angle": -45.0,
-            # "shadow_color": "",
-            # "shadow_distance": 5.0,
-            # "shadow_point": {
-            #     "x": 0.6363961030678928,
-            #     "y": -0.6363961030678928
-            # },
-            # "shadow_smoothing": 0.45,
-
-            # 整体字体设置, 似乎会被content覆盖
-            # "font_category_id": "",
-            # "font_category_name": "",
-            # "font_id": "",
-            # "font_name": "",
-            # "font_path": "",
-            # "font_resource_id": "",
-            # "font_size": 15.0,
-            # "font_source_platform": 0,
-            # "font_team_id": "",
-            # "font_title": "none",
-            # "font_url": "",
-            # "fonts": [],
-
-            # 似乎会被content覆盖
-            # "text_alpha": 1.0,
-            # "text_color": "#FFFFFF",
-            # "text_curve": None,
-            # "text_preset_resource_id": "",
-            # "text_size": 30,
-            # "underline": False,
-
-
-            "base_content": "",
-            "bold_width": 0.0,
-
-            "check_flag": check_flag,
-            "combo_info": {
-                "text_templates": []
-            },
-            "content": json.dumps({
-                "styles": [
-                    {
-                        "fill": {
-                            "alpha": 1.0,
-                            "content": {
-                                "render_type": "solid",
-                                "solid": {
-                                    "alpha": self.style.alpha,
-                                    "color": list(self.style.color)
-                                }
-                            }
-                        },
-                        # "font": {
-                        #     "id": "",
-                        #     "path": "***.ttf"
-                        # },
-                        "range": [0, len(self.text)],
-                        "size": self.style.size,
-                        "bold": self.style.bold,
-                        "italic": self.style.italic,
-                        "underline": self.style.underline,
-                        "strokes": [self.border.export_json()] if self.border else []
-                    }
-                ],
-                "text": self.text
-            }),
-            "fixed_height": -1.0,
-            "fixed_width": -1.0,
-            "force_apply_line_max_width": False,
-
-            "group_id": "",
-
-            "id": self.material_id,
-            "initial_scale": 1.0,
-            "inner_padding": -1.0,
-            "is_rich_text": False,
-            "italic_degree": 0,
-            "ktv_color": "",
-            "language": "",
-            "layer_weight": 1,
-            "letter_spacing": 0.0,
-            "line_feed": 1,
-            "line_max_width": 0.82,
-            "line_spacing": 0.02,
-            "multi_language_current": "none",
-            "name": "",
-            "original_size": [],
-
-            "preset_category": "",
-            "preset_category_id": "",
-            "preset_has_set_alignment": False,
-            "preset_id": "",
-            "preset_index": 0,
-            "preset_name": "",
-
-            "recognize_task_id": "",
-            "recognize_type": 0,
-            "relevance_segment": [],
-
-            "shape_clip_x": False,
-            "shape_clip_y": False,
-            "source_from": "",
-            "style_name": "",
-            "sub_type": 0,
-            "subtitle_keywords": None,
-            "subtitle_template_original_fontsize": 0.0,
-            "text_to_audio_ids": [],
-            "tts_auto_update": False,
-            "type": "text",
-
-            "underline_offset": 0.22,
-            "underline_width": 0.05,
-
-            "use_effect_default_color": True,
-            "words": {
-                "end_time": [],
-                "start_time": [],
-                "text": []
-            }
-        }
+        # 复制共享模板后逐项写入, 比`{**模板, ...}`形式的合并更快
+        material = _TEXT_MATERIAL_DEFAULTS.copy()
+
+        material["typesetting"] = int(self.style.vertical)
+        material["alignment"] = self.style.align
+
+        material["check_flag"] = check_flag
+        material["combo_info"] = {"text_templates": []}
+        material["content"] = self._export_content()
+
+        material["id"] = self.material_id
+        material["original_size"] = []
+        material["relevance_segment"] = []
+        material["text_to_audio_ids"] = []
+        material["words"] = {"end_time": [], "start_time": [], "text": []}
+        return material
 
     def export_json(self) -> Dict[str, Any]:
         ret = super().export_json()
-        ret.update({
-            # 与Video_segment一致的部分
-            "clip": self.clip_settings.export_json(),
-            # "hdr_settings": null,
-            # "uniform_scale": {},
-
-            # 与Media_segment一致的部分
-            "source_timerange": None,
-            "speed": 1.0,
-            "volume": 1.0,
-            "extra_material_refs": self.extra_material_refs,
-        })
+        # 与Video_segment一致的部分, 不导出hdr_settings及uniform_scale
+        ret["clip"] = self.clip_settings.export_json()
+        # 与Media_segment一致的部分
+        ret.update(_TEXT_SEGMENT_DEFAULTS)
+        ret["extra_material_refs"] = self.extra_material_refs
         return ret
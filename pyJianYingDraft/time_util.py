@@ -33,6 +33,9 @@ def tim(inp: Union[str, float]) -> int:
 
 class Timerange:
     """记录了起始时间及持续长度的时间范围"""
+
+    __slots__ = ("start", "duration")
+
     start: int
     """起始时间, 单位为微秒"""
     duration: int
@@ -1,12 +1,59 @@
 """辅助函数，主要与模板模式有关"""
 
+import os
 import inspect
+import threading
+import functools
 
-from typing import Union, Type
+from typing import Union, Type, Callable
 from typing import List, Dict, Any
 
 JsonExportable = Union[int, float, bool, str, List["JsonExportable"], Dict[str, "JsonExportable"]]
 
+class _Uuid_pool:
+    """批量读取随机字节的uuid池, 以减少频繁调用`uuid.uuid4()`的开销"""
+
+    BATCH_SIZE = 1024
+    """每次补充时生成的uuid个数"""
+
+    pool: bytearray
+    """随机字节缓冲区"""
+    offset: int
+    """下一个未使用字节的位置"""
+    lock: threading.Lock
+    """保证多线程下读取与推进位置的操作不被打断"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """清空缓冲区, 在fork出的子进程中调用, 以免与父进程生成相同的uuid序列"""
+        self.pool = bytearray()
+        self.offset = 0
+        self.lock = threading.Lock()
+
+    def next_hex(self) -> str:
+        """取出16个随机字节, 按uuid4的规则设置版本位后返回其十六进制表示"""
+        with self.lock:
+            if self.offset >= len(self.pool):
+                self.pool = bytearray(os.urandom(16 * self.BATCH_SIZE))
+                self.offset = 0
+
+            chunk = self.pool[self.offset:self.offset+16]
+            self.offset += 16
+
+        chunk[6] = (chunk[6] & 0x0F) | 0x40  # version 4
+        chunk[8] = (chunk[8] & 0x3F) | 0x80  # RFC 4122 variant
+        return chunk.hex()
+
+_uuid_pool = _Uuid_pool()
+if hasattr(os, "register_at_fork"):  # Windows下不存在fork
+    os.register_at_fork(after_in_child=_uuid_pool.reset)
+
+def fast_hex_uuid() -> str:
+    """生成一个随机uuid的十六进制字符串, 格式与`uuid.uuid4().hex`一致"""
+    return _uuid_pool.next_hex()
+
 def provide_ctor_defaults(cls: Type) -> Dict[str, Any]:
     """为构造函数提供默认值，以绕开构造函数的参数限制"""
 
@@ -28,21 +75,24 @@ def provide_ctor_defaults(cls: Type) -> Dict[str, Any]:
 
     return provided_defaults
 
+@functools.lru_cache(maxsize=None)
+def _json_importers(cls: Type) -> Dict[str, Callable[[Any], Any]]:
+    """根据类型注解为类的各属性确定从json数据构造值的函数, 结果按类缓存"""
+    type_hints: Dict[str, Type] = {}
+    for base in cls.__mro__:
+        if '__annotations__' in base.__dict__:
+            type_hints.update(base.__annotations__)
+
+    return {attr: getattr(hint, 'import_json', hint) for attr, hint in type_hints.items()}
+
 def assign_attr_with_json(obj: object, attrs: List[str], json_data: Dict[str, Any]):
     """根据json数据赋值给指定的对象属性
 
     若有复杂类型，则尝试调用其`import_json`方法进行构造
     """
-    type_hints: Dict[str, Type] = {}
-    for cls in obj.__class__.__mro__:
-        if '__annotations__' in cls.__dict__:
-            type_hints.update(cls.__annotations__)
-
+    importers = _json_importers(obj.__class__)
     for attr in attrs:
-        if hasattr(type_hints[attr], 'import_json'):
-            obj.__setattr__(attr, type_hints[attr].import_json(json_data[attr]))
-        else:
-            obj.__setattr__(attr, type_hints[attr](json_data[attr]))
+        setattr(obj, attr, importers[attr](json_data[attr]))
 
 def export_attr_to_json(obj: object, attrs: List[str]) -> Dict[str, JsonExportable]:
     """将对象属性导出为json数据
@@ -51,8 +101,6 @@ def export_attr_to_json(obj: object, attrs: List[str]) -> Dict[str, JsonExportab
     """
     json_data: Dict[str, Any] = {}
     for attr in attrs:
-        if hasattr(getattr(obj, attr), 'export_json'):
-            json_data[attr] = getattr(obj, attr).export_json()
-        else:
-            json_data[attr] = getattr(obj, attr)
+        value = getattr(obj, attr)
+        json_data[attr] = value.export_json() if hasattr(value, 'export_json') else value
     return json_data
@@ -16,6 +16,8 @@ from .metadata import Video_scene_effect_type, Video_character_effect_type
 
 from .text_segment import Text_segment, Text_style, Text_border  # 引入Text_segment 和 Text_style
 
+_HDR_SETTINGS: Dict[str, Any] = {"intensity": 1.0, "mode": 1, "nits": 1000}
+"""视频片段的默认HDR设置, 各片段共享, 不应被修改"""
 
 class Mask:
     """蒙版对象"""
@@ -243,6 +245,9 @@ class Transition:
 class Video_segment(Media_segment):
     """安放在轨道上的一个视频/图片片段"""
 
+    __slots__ = ("material_size", "clip_settings", "uniform_scale",
+                 "effects", "filters", "animations_instance", "mask", "transition")
+
     material_size: Tuple[int, int]
     """素材尺寸"""
 
@@ -396,13 +401,10 @@ class Video_segment(Media_segment):
 
         if isinstance(time_offset, str): time_offset = tim(time_offset)
 
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, value)
-                return self
-        kf_list = Keyframe_list(_property)
+        kf_list = self.common_keyframes.get(_property)
+        if kf_list is None:
+            kf_list = self.common_keyframes[_property] = Keyframe_list(_property)
         kf_list.add_keyframe(time_offset, value)
-        self.common_keyframes.append(kf_list)
         return self
     
     def add_text(self, text: str, time_range: Timerange, *, text_style: Optional[Text_style] = None, border: Optional[Text_border] = None, clip_settings: Optional[Clip_settings] = None) -> Text_segment:
@@ -475,11 +477,9 @@ class Video_segment(Media_segment):
 
     def export_json(self) -> Dict[str, Any]:
         json_dict = super().export_json()
-        json_dict.update({
-            "clip": self.clip_settings.export_json(),
-            "hdr_settings": {"intensity": 1.0, "mode": 1, "nits": 1000},
-            "uniform_scale": {"on": self.uniform_scale, "value": 1.0},
-        })
+        json_dict["clip"] = self.clip_settings.export_json()
+        json_dict["hdr_settings"] = _HDR_SETTINGS
+        json_dict["uniform_scale"] = {"on": self.uniform_scale, "value": 1.0}
         return json_dict
 
 class Sticker_segment(Media_segment):